@@ -13,85 +13,146 @@
 # ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
 
 import argparse
+import functools
+import os
 import pathlib
+import re
+import threading
 from dotenv import load_dotenv
 
-from camel.models import ModelFactory
-from camel.toolkits import (
-    SearchToolkit,
-    ArxivToolkit,
-    GoogleScholarToolkit,
-    SemanticScholarToolkit,
-    CodeExecutionToolkit,
-    FileWriteToolkit,
-)
-from camel.types import ModelPlatformType, ModelType
-from camel.logger import set_log_level
-
-from owl.utils import run_society
-from camel.societies import RolePlaying
-
-# Load environment variables
+from camel.logger import get_logger, set_log_level
+
+# Models, toolkits and owl.utils are imported inside the functions that use
+# them, so that `--help` and argument errors don't pay for loading them
+
 base_dir = pathlib.Path(__file__).parent.parent
 env_path = base_dir / ".env"
-load_dotenv(dotenv_path=str(env_path))
 
 # Set logging level for debugging
 set_log_level(level="INFO")
+logger = get_logger(__name__)
 
 
-def construct_scientific_essay_society(topic, pages, instructions):
-    """Construct a society of agents for generating scientific essays.
+# Matches every character for which str.isalnum() is False (\w is exactly
+# isalnum() plus the underscore)
+_UNSAFE_FILENAME_CHARS = re.compile(r"[\W_]")
+
+# Approximate number of words per page, a common estimate
+WORDS_PER_PAGE = 500
+
+_model_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=32)
+def _create_model(model_platform, model_type, temperature, api_key):
+    from camel.models import ModelFactory
+
+    return ModelFactory.create(
+        model_platform=model_platform,
+        model_type=model_type,
+        model_config_dict={"temperature": temperature},
+        api_key=api_key,
+    )
+
+
+def _make_model(model_platform, model_type, temperature, api_key=None):
+    """Return a model backend, reusing an existing one with the same settings.
     
-    Args:
-        topic (str): The scientific topic for the essay
-        pages (int): Approximate number of pages for the essay
-        instructions (str): Additional instructions for essay generation
-        
-    Returns:
-        RolePlaying: A configured society of agents ready to generate the essay
+    The OpenAI API key (by default the current one from the environment) is
+    part of the cache key, since the web app switches keys between requests.
     """
+    with _model_lock:
+        return _create_model(
+            model_platform,
+            model_type,
+            temperature,
+            api_key or os.environ.get("OPENAI_API_KEY"),
+        )
+
+
+def safe_topic_name(topic):
+    """Replace every non-alphanumeric character of a topic with an underscore."""
+    return _UNSAFE_FILENAME_CHARS.sub("_", topic)
+
+
+@functools.lru_cache(maxsize=8)
+def _create_static_resources(api_key, enable_code):
+    from camel.toolkits import FileWriteToolkit
+    from camel.types import ModelPlatformType, ModelType
     
-    # Calculate approximate word count based on pages (500 words per page is a common estimate)
-    word_count = pages * 500
+    from owl.utils import DiskCache, ParallelSearchToolkit
     
-    # Create models for different components
+    # Create models for different components. Roles with the same
+    # configuration share one cached model instance.
     models = {
-        "user": ModelFactory.create(
-            model_platform=ModelPlatformType.OPENAI,
-            model_type=ModelType.GPT_4O,
-            model_config_dict={"temperature": 0.1},
-        ),
-        "assistant": ModelFactory.create(
-            model_platform=ModelPlatformType.OPENAI,
-            model_type=ModelType.GPT_4O,
-            model_config_dict={"temperature": 0.1},
-        ),
-        "researcher": ModelFactory.create(
-            model_platform=ModelPlatformType.OPENAI,
-            model_type=ModelType.GPT_4O,
-            model_config_dict={"temperature": 0.1},
+        "user": _make_model(ModelPlatformType.OPENAI, ModelType.GPT_4O, 0.1, api_key),
+        "assistant": _make_model(
+            ModelPlatformType.OPENAI, ModelType.GPT_4O_MINI, 0.1, api_key
         ),
+        "researcher": _make_model(ModelPlatformType.OPENAI, ModelType.GPT_4O, 0.1, api_key),
     }
 
+    # Research results are cached on disk and shared across essay runs
+    research_cache = DiskCache("./.owl_cache")
+
     # Configure specialized research toolkits for scientific content
     tools = [
-        # Academic research tools
-        *ArxivToolkit().get_tools(),
-        *SemanticScholarToolkit().get_tools(),
-        *GoogleScholarToolkit().get_tools(),
-        
-        # General search capabilities
-        SearchToolkit().search_duckduckgo,
-        SearchToolkit().search_wiki,
-        
-        # For creating visualizations or analyzing data
-        *CodeExecutionToolkit(sandbox="subprocess").get_tools(),
+        # Academic and general search (Arxiv, Semantic Scholar, DuckDuckGo
+        # and Wikipedia), queried in parallel with duplicate papers removed
+        *ParallelSearchToolkit(cache=research_cache).get_tools(),
         
         # For saving the generated essay
         *FileWriteToolkit(output_dir="./essays/").get_tools(),
     ]
 
+    # For creating visualizations or analyzing data
+    if enable_code:
+        from camel.toolkits import CodeExecutionToolkit
+
+        tools.extend(CodeExecutionToolkit(sandbox="subprocess").get_tools())
+
+    return models, tools
+
+
+_resources_lock = threading.Lock()
+
+
+def get_static_resources(enable_code=True, api_key=None):
+    """Return the models and tools of the essay society.
+    
+    They don't depend on the essay, so they are built once per API key and
+    reused by every society.
+    
+    Args:
+        enable_code (bool): Whether the assistant may execute code, e.g. to
+            create visualizations
+        api_key (str, optional): OpenAI API key, defaults to the environment
+        
+    Returns:
+        tuple: (models by role, list of tools for the research assistant)
+    """
+    with _resources_lock:
+        return _create_static_resources(
+            api_key or os.environ.get("OPENAI_API_KEY"), enable_code
+        )
+
+
+def build_society(topic, pages, instructions, resources):
+    """Build the essay society from prebuilt models and tools.
+    
+    Args:
+        topic (str): The scientific topic for the essay
+        pages (int): Approximate number of pages for the essay
+        instructions (str): Additional instructions for essay generation
+        resources (tuple): (models, tools) as returned by get_static_resources()
+        
+    Returns:
+        RolePlaying: A configured society of agents ready to generate the essay
+    """
+    from camel.societies import RolePlaying
+    
+    models, tools = resources
+    
     # Configure agent roles and parameters
     user_agent_kwargs = {"model": models["user"]}
     assistant_agent_kwargs = {
@@ -100,6 +161,7 @@ def construct_scientific_essay_society(topic, pages, instructions):
     }
 
     # Construct the task prompt with all parameters
+    word_count = pages * WORDS_PER_PAGE
     task_prompt = (
         f"I need a comprehensive scientific essay on the topic: '{topic}'. "
         f"The essay should be approximately {word_count} words (about {pages} pages). "
@@ -114,6 +176,9 @@ def construct_scientific_essay_society(topic, pages, instructions):
     society = RolePlaying(
         task_prompt=task_prompt,
         with_task_specify=True,  # This enables more detailed task planning
+        # Without an explicit model the task specifier would fall back to a
+        # default model using the API key from the environment
+        task_specify_agent_kwargs={"model": models["user"]},
         user_role_name="scientific advisor",
         user_agent_kwargs=user_agent_kwargs,
         assistant_role_name="research assistant",
@@ -123,13 +188,142 @@ def construct_scientific_essay_society(topic, pages, instructions):
     return society
 
 
+def construct_scientific_essay_society(topic, pages, instructions, enable_code=True):
+    """Construct a society of agents for generating scientific essays.
+    
+    The research assistant writes the essay with GPT-4o-mini, while the
+    scientific advisor that plans and critiques the work uses GPT-4o.
+    
+    Args:
+        topic (str): The scientific topic for the essay
+        pages (int): Approximate number of pages for the essay
+        instructions (str): Additional instructions for essay generation
+        enable_code (bool): Whether the assistant may execute code, e.g. to
+            create visualizations
+        
+    Returns:
+        RolePlaying: A configured society of agents ready to generate the essay
+    """
+    return build_society(
+        topic, pages, instructions, get_static_resources(enable_code)
+    )
+
+
+def saved_essay(round_data):
+    """Return the essay the assistant saved with the file tool in a round.
+    
+    The assistant's final message usually only says where the essay was
+    saved, so the essay itself is taken from the file write tool call.
+    
+    Args:
+        round_data (dict): One conversation round as passed to the
+            `on_round` callback of `run_society`
+        
+    Returns:
+        str or None: The content of the last file written in the round
+    """
+    for record in reversed(round_data.get("tool_calls") or []):
+        content = (record.get("args") or {}).get("content")
+        if record.get("tool_name") == "write_to_file" and isinstance(content, str):
+            return content
+    return None
+
+
+def _looks_like_essay(text, pages):
+    """Check that a draft is an essay rather than a short status message."""
+    has_heading = any(line.startswith("#") for line in text.splitlines())
+    return has_heading and len(text.split()) >= WORDS_PER_PAGE * pages // 4
+
+
+def revise_essay(essay, topic, pages, instructions, api_key=None):
+    """Revise a drafted essay in a single pass with GPT-4o.
+    
+    The draft is returned unchanged if it does not look like an essay, or if
+    the revision was cut off by the model's output limit.
+    
+    Args:
+        essay (str): The drafted essay in Markdown
+        topic (str): The scientific topic for the essay
+        pages (int): Approximate number of pages for the essay
+        instructions (str): Additional instructions for essay generation
+        api_key (str, optional): OpenAI API key, defaults to the environment
+        
+    Returns:
+        tuple: (revised essay, token usage of the revision)
+    """
+    from camel.agents import ChatAgent
+    from camel.types import ModelPlatformType, ModelType
+    
+    if not _looks_like_essay(essay, pages):
+        logger.warning("The draft does not look like an essay, skipping the revision")
+        return essay, {}
+    
+    reviser = ChatAgent(
+        system_message=(
+            "You are a senior scientific editor. You revise essays for accuracy, "
+            "clarity, structure and proper citation, and reply with the complete "
+            "revised essay in Markdown only."
+        ),
+        model=_make_model(ModelPlatformType.OPENAI, ModelType.GPT_4O, 0.1, api_key),
+    )
+    response = reviser.step(
+        f"Revise the following scientific essay on '{topic}'. It should be about "
+        f"{pages} pages long and meet these requirements: {instructions}. Keep all "
+        f"references that are correct.\n\n{essay}"
+    )
+    usage = response.info.get("usage") or {}
+    
+    if not response.msgs:
+        logger.warning("The revision returned no message, keeping the draft")
+        return essay, usage
+    if "length" in (response.info.get("termination_reasons") or []):
+        logger.warning("The revision was truncated, keeping the draft")
+        return essay, usage
+    return response.msgs[0].content, usage
+
+
+def lookup_cached_essay(cache, text, tag, topic, embedding=None):
+    """Look up an essay for a similar request in the semantic cache.
+    
+    The cache is only an optimization, so a failing lookup (e.g. a rate
+    limited embedding request) is logged and treated as a miss.
+    
+    Returns:
+        tuple or None: The cached (essay, path), or None
+    """
+    try:
+        return cache.lookup(text, tag=tag, topic=topic, embedding=embedding)
+    except Exception as e:
+        logger.warning(f"Essay cache lookup failed, generating a new essay: {e}")
+        return None
+
+
+def add_cached_essay(cache, text, essay, path, tag, topic, embedding=None):
+    """Store a generated essay in the semantic cache.
+    
+    A failure is logged and skipped, as the essay itself is already saved.
+    """
+    try:
+        cache.add(text, essay, path, tag=tag, topic=topic, embedding=embedding)
+    except Exception as e:
+        logger.warning(f"Failed to add the essay to the cache: {e}")
+
+
+def _page_count(value):
+    """Parse a page count for argparse, rejecting values below one."""
+    pages = int(value)
+    if pages < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {pages}")
+    return pages
+
+
 def main():
     """Main function to run the scientific essay generator."""
     
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Generate scientific essays with OWL")
     parser.add_argument("--topic", type=str, required=True, help="Scientific topic for the essay")
-    parser.add_argument("--pages", type=int, default=5, help="Approximate number of pages (default: 5)")
+    parser.add_argument("--pages", type=_page_count, default=5, help="Approximate number of pages (default: 5)")
     parser.add_argument(
         "--instructions", 
         type=str, 
@@ -142,38 +336,130 @@ def main():
         default=None, 
         help="Output filename (default: auto-generated based on topic)"
     )
+    parser.add_argument(
+        "--quality",
+        choices=["draft", "final"],
+        default="final",
+        help="'draft' returns the GPT-4o-mini essay as is, 'final' adds a GPT-4o revision pass (default: final)"
+    )
+    parser.add_argument(
+        "--no-code",
+        action="store_true",
+        help="Don't let the agents execute code (e.g. for visualizations)"
+    )
+    parser.add_argument(
+        "--save-history",
+        action="store_true",
+        help="Also save the agents' chat history (compressed) next to the essay"
+    )
+    parser.add_argument(
+        "--history-path",
+        type=str,
+        default=None,
+        help="Save the chat history to this file (.json.zst, .json.gz or .json); implies --save-history"
+    )
+    parser.add_argument(
+        "--no-cache",
+        "--force",
+        action="store_true",
+        help="Always generate a new essay instead of reusing one for a similar request"
+    )
     
     args = parser.parse_args()
     
+    from owl.utils import (
+        run_society,
+        AsyncFileWriter,
+        SemanticCache,
+        default_history_suffix,
+        encode_history,
+    )
+    
+    save_history = args.save_history or args.history_path is not None
+    if (
+        args.history_path
+        and args.history_path.endswith(".zst")
+        and default_history_suffix() != ".json.zst"
+    ):
+        parser.error("--history-path with .zst requires the `zstandard` package")
+    
+    # Load environment variables
+    load_dotenv(dotenv_path=str(env_path))
+    
     # Create output directory if it doesn't exist
     pathlib.Path("./essays").mkdir(exist_ok=True)
     
-    # Construct and run the society
-    society = construct_scientific_essay_society(
-        topic=args.topic,
-        pages=args.pages,
-        instructions=args.instructions
-    )
-    
     print(f"Generating a {args.pages}-page scientific essay on: {args.topic}")
     print(f"With instructions: {args.instructions}")
-    print("\nThis may take some time depending on the length and complexity...\n")
     
-    answer, chat_history, token_count = run_society(society)
+    # Reuse an essay generated for a semantically equivalent request
+    cache = SemanticCache("./essays/.semantic_cache")
+    cache_text = f"{args.topic}\n{args.instructions}"
+    cache_tag = f"{args.pages}:{args.quality}"
+    cached = None
+    if not args.no_cache:
+        cached = lookup_cached_essay(cache, cache_text, cache_tag, args.topic)
+    
+    if cached is not None:
+        answer, _ = cached
+        token_count = 0
+        print("\nFound an essay for a similar request in the cache.\n")
+    else:
+        # Construct and run the society
+        society = construct_scientific_essay_society(
+            topic=args.topic,
+            pages=args.pages,
+            instructions=args.instructions,
+            enable_code=not args.no_code,
+        )
+        
+        print("\nThis may take some time depending on the length and complexity...\n")
+        
+        saved = []
+        answer, chat_history, token_count = run_society(
+            society,
+            on_round=lambda data: saved.append(saved_essay(data)),
+            keep_history=save_history,
+        )
+        # Prefer the essay the assistant saved over its final message
+        answer = next((essay for essay in reversed(saved) if essay), answer)
+        
+        if args.quality == "final":
+            print("\nRevising the essay...\n")
+            answer, usage = revise_essay(
+                answer, args.topic, args.pages, args.instructions
+            )
+            token_count["completion_token_count"] += usage.get("completion_tokens", 0)
+            token_count["prompt_token_count"] += usage.get("prompt_tokens", 0)
     
     # Generate output filename if not provided
     if args.output is None:
         # Create safe filename from topic
-        safe_topic = "".join(c if c.isalnum() else "_" for c in args.topic)
+        safe_topic = safe_topic_name(args.topic)
         output_filename = f"./essays/scientific_essay_{safe_topic}.md"
     else:
         output_filename = f"./essays/{args.output}"
         if not output_filename.endswith(".md"):
             output_filename += ".md"
     
-    # Save the essay to a file
-    with open(output_filename, "w") as f:
-        f.write(answer)
+    # Save the essay (and history) in the background while the cache is updated
+    writer = AsyncFileWriter()
+    writer.write(output_filename, answer)
+    
+    if save_history and cached is None:
+        history_filename = args.history_path or (
+            output_filename[: -len(".md")] + "_history" + default_history_suffix()
+        )
+        writer.write(history_filename, encode_history(chat_history, history_filename))
+    
+    if cached is None:
+        add_cached_essay(
+            cache, cache_text, answer, output_filename, cache_tag, args.topic
+        )
+    
+    writer.flush()
+    if save_history and cached is None:
+        print(f"Chat history saved to: {history_filename}")
     
     print(f"\n\033[92mEssay successfully generated and saved to: {output_filename}\033[0m")
     print(f"Total tokens used: {token_count}")
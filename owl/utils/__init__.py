@@ -21,6 +21,12 @@ from .enhanced_role_playing import (
 )
 from .gaia import GAIABenchmark
 from .document_toolkit import DocumentProcessingToolkit
+from .parallel_search_toolkit import ParallelSearchToolkit
+from .semantic_cache import SemanticCache
+from .tool_cache import DiskCache
+from .http import get_shared_session
+from .async_writer import AsyncFileWriter
+from .history import encode_history, load_history, default_history_suffix
 
 __all__ = [
     "extract_pattern",
@@ -30,4 +36,12 @@ __all__ = [
     "arun_society",
     "GAIABenchmark",
     "DocumentProcessingToolkit",
+    "ParallelSearchToolkit",
+    "SemanticCache",
+    "DiskCache",
+    "get_shared_session",
+    "AsyncFileWriter",
+    "encode_history",
+    "load_history",
+    "default_history_suffix",
 ]
@@ -0,0 +1,123 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import atexit
+import os
+import queue
+import threading
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncFileWriter:
+    r"""Writes files on a background thread.
+
+    :meth:`write` only enqueues the content and returns immediately. The
+    writer thread coalesces queued writes to the same path (the last one
+    wins), writes each file once and fsyncs it. :meth:`flush` blocks until
+    everything queued so far is on disk, and is also called at interpreter
+    exit.
+
+    Failures are recorded per path until the file is written successfully or
+    flushed, so a caller flushing its own files only sees their errors.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[str, Union[str, bytes]]]" = queue.Queue()
+        self._errors: Dict[str, Exception] = {}
+        self._errors_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self._flush_at_exit)
+
+    def write(self, path: Union[str, os.PathLike], data: Union[str, bytes]) -> None:
+        r"""Queue `data` to be written to `path`, replacing its content.
+
+        Args:
+            path (Union[str, os.PathLike]): The file to write.
+            data (Union[str, bytes]): Text (written as UTF-8) or bytes.
+        """
+        self._queue.put((os.fspath(path), data))
+
+    def flush(self, paths: Optional[Iterable[Union[str, os.PathLike]]] = None) -> None:
+        r"""Block until all queued writes are written and fsynced.
+
+        Args:
+            paths (Optional[Iterable[Union[str, os.PathLike]]]): Only report
+                failures for these files. If `None`, failures for all files
+                are reported. (default: :obj:`None`)
+
+        Raises:
+            Exception: The first failed write among `paths` since they were
+                last flushed.
+        """
+        self._queue.join()
+        with self._errors_lock:
+            if paths is None:
+                errors = list(self._errors.values())
+                self._errors.clear()
+            else:
+                errors = [
+                    self._errors.pop(path)
+                    for path in map(os.fspath, paths)
+                    if path in self._errors
+                ]
+        if errors:
+            raise errors[0]
+
+    def _flush_at_exit(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            # Already logged by the writer thread
+            pass
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            # Coalesce everything that is already queued into this batch
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                batch: Dict[str, Union[str, bytes]] = dict(items)
+                for path, data in batch.items():
+                    try:
+                        self._write_file(path, data)
+                    except Exception as e:
+                        logger.error(f"Failed to write {path}: {e}")
+                        with self._errors_lock:
+                            self._errors[path] = e
+                    else:
+                        # A later successful write supersedes an earlier failure
+                        with self._errors_lock:
+                            self._errors.pop(path, None)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    @staticmethod
+    def _write_file(path: str, data: Union[str, bytes]) -> None:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
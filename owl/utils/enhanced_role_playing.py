@@ -12,7 +12,7 @@
 # limitations under the License.
 # ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 
 from camel.agents import ChatAgent
@@ -440,6 +440,8 @@ class OwlGAIARolePlaying(OwlRolePlaying):
 def run_society(
     society: OwlRolePlaying,
     round_limit: int = 15,
+    on_round: Optional[Callable[[dict], None]] = None,
+    keep_history: bool = True,
 ) -> Tuple[str, List[dict], dict]:
     overall_completion_token_count = 0
     overall_prompt_token_count = 0
@@ -476,7 +478,14 @@ def run_society(
             "tool_calls": tool_call_records,
         }
 
-        chat_history.append(_data)
+        # Without keep_history only the latest round is retained, which is
+        # all that is needed to extract the answer
+        if keep_history:
+            chat_history.append(_data)
+        else:
+            chat_history = [_data]
+        if on_round is not None:
+            on_round(_data)
         logger.info(
             f"Round #{_round} user_response:\n {user_response.msgs[0].content if user_response.msgs and len(user_response.msgs) > 0 else ''}"
         )
@@ -505,6 +514,8 @@ def run_society(
 async def arun_society(
     society: OwlRolePlaying,
     round_limit: int = 15,
+    on_round: Optional[Callable[[dict], None]] = None,
+    keep_history: bool = True,
 ) -> Tuple[str, List[dict], dict]:
     overall_completion_token_count = 0
     overall_prompt_token_count = 0
@@ -518,9 +529,9 @@ async def arun_society(
         assistant_response, user_response = await society.astep(input_msg)
         # Check if usage info is available before accessing it
         if assistant_response.info.get("usage") and user_response.info.get("usage"):
-            overall_prompt_token_count += assistant_response.info["usage"].get(
+            overall_completion_token_count += assistant_response.info["usage"].get(
                 "completion_tokens", 0
-            )
+            ) + user_response.info["usage"].get("completion_tokens", 0)
             overall_prompt_token_count += assistant_response.info["usage"].get(
                 "prompt_tokens", 0
             ) + user_response.info["usage"].get("prompt_tokens", 0)
@@ -541,7 +552,14 @@ async def arun_society(
             "tool_calls": tool_call_records,
         }
 
-        chat_history.append(_data)
+        # Without keep_history only the latest round is retained, which is
+        # all that is needed to extract the answer
+        if keep_history:
+            chat_history.append(_data)
+        else:
+            chat_history = [_data]
+        if on_round is not None:
+            on_round(_data)
         logger.info(
             f"Round #{_round} user_response:\n {user_response.msgs[0].content if user_response.msgs and len(user_response.msgs) > 0 else ''}"
         )
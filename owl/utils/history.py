@@ -0,0 +1,93 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import gzip
+import json
+import os
+from typing import List, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Chat histories repeat role names and tool schemas a lot, so even a low
+# zstd level compresses them well while staying fast
+ZSTD_LEVEL = 3
+
+
+def default_history_suffix() -> str:
+    r"""Return the preferred file suffix for compressed chat histories:
+    `.json.zst` if `zstandard` is installed, `.json.gz` otherwise.
+    """
+    return ".json.zst" if zstandard is not None else ".json.gz"
+
+
+def _dumps(chat_history: List[dict]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(chat_history, default=str)
+    return json.dumps(chat_history, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def encode_history(chat_history: List[dict], path: Union[str, os.PathLike]) -> bytes:
+    r"""Serialize a chat history to the bytes of a history file at `path`.
+
+    The format follows the file extension: `.json.zst` is zstd-compressed,
+    `.json.gz` gzip-compressed and anything else plain JSON.
+
+    Args:
+        chat_history (List[dict]): The chat history returned by
+            :func:`run_society`.
+        path (Union[str, os.PathLike]): The file the history is meant for.
+
+    Returns:
+        bytes: The encoded file content.
+    """
+    path = os.fspath(path)
+    data = _dumps(chat_history)
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError("Writing .zst histories requires `zstandard`")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if path.endswith(".gz"):
+        return gzip.compress(data)
+    return data
+
+
+def load_history(path: Union[str, os.PathLike]) -> List[dict]:
+    r"""Load a chat history saved with :func:`encode_history`.
+
+    Args:
+        path (Union[str, os.PathLike]): The history file.
+
+    Returns:
+        List[dict]: The chat history.
+    """
+    path = os.fspath(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError("Reading .zst histories requires `zstandard`")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif path.endswith(".gz"):
+        data = gzip.decompress(data)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
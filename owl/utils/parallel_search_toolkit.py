@@ -0,0 +1,226 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import asyncio
+import functools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from camel.toolkits.base import BaseToolkit
+from camel.toolkits.function_tool import FunctionTool
+from camel.toolkits import ArxivToolkit, SearchToolkit
+from camel.logger import get_logger
+
+from .http import get_shared_session
+from .tool_cache import DiskCache
+
+logger = get_logger(__name__)
+
+# Everything except letters and digits is ignored when comparing titles
+_TITLE_NOISE = re.compile(r"[\W_]+")
+
+
+class ParallelSearchToolkit(BaseToolkit):
+    r"""A toolkit that queries several research sources concurrently.
+
+    The agent would otherwise call Arxiv, Semantic Scholar, DuckDuckGo and
+    Wikipedia one after another. This toolkit fans a single query out to all
+    of them at once, so the research phase waits for the slowest source
+    instead of the sum of all of them.
+
+    Semantic Scholar papers whose title matches an Arxiv result (ignoring
+    case, punctuation and whitespace) are dropped.
+
+    If a cache is given, the results of each source are cached per query.
+
+    The sources are blocking calls, so they run on a thread pool owned by the
+    toolkit, which bounds them to `max_concurrency`. :meth:`multi_search`
+    can therefore also be called from within a running event loop.
+
+    Semantic Scholar is queried through `session` (by default the shared
+    session from :func:`get_shared_session`), so its connections are kept
+    alive across calls.
+    """
+
+    SEMANTIC_SCHOLAR_SEARCH_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
+    SEMANTIC_SCHOLAR_FIELDS = "title,url,publicationTypes,publicationDate,openAccessPdf"
+
+    def __init__(
+        self,
+        max_results: int = 5,
+        max_concurrency: int = 5,
+        cache: Optional[DiskCache] = None,
+        session: Optional[requests.Session] = None,
+    ):
+        self.max_results = max_results
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.session = session or get_shared_session()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="multi_search"
+        )
+
+        self.arxiv_toolkit = ArxivToolkit()
+        self.search_toolkit = SearchToolkit()
+
+    def _search_semantic_scholar(self, query: str) -> Dict[str, Any]:
+        response = self.session.get(
+            self.SEMANTIC_SCHOLAR_SEARCH_URL,
+            params={
+                "query": query,
+                "limit": self.max_results,
+                "fields": self.SEMANTIC_SCHOLAR_FIELDS,
+            },
+            timeout=30,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _is_duckduckgo_error(result: Any) -> bool:
+        # SearchToolkit reports a failed DuckDuckGo search as
+        # `[{"error": "duckduckgo search failed..."}]`
+        return isinstance(result, list) and any(
+            isinstance(item, dict) and "error" in item for item in result
+        )
+
+    @staticmethod
+    def _is_wiki_error(result: Any) -> bool:
+        # SearchToolkit returns the exception message of a failed Wikipedia
+        # search as the result
+        return isinstance(result, str) and result.startswith("An exception occurred")
+
+    def _sources(self, query: str) -> Dict[str, Callable[[], Any]]:
+        sources = {
+            "arxiv": lambda: self.arxiv_toolkit.search_papers(
+                query, max_results=self.max_results
+            ),
+            "semantic_scholar": lambda: self._search_semantic_scholar(query),
+            "duckduckgo": lambda: self.search_toolkit.search_duckduckgo(
+                query, max_results=self.max_results
+            ),
+            "wiki": lambda: self.search_toolkit.search_wiki(query),
+        }
+        if self.cache is None:
+            return sources
+
+        # Failures returned as values must not be cached like results
+        error_checks = {
+            "duckduckgo": self._is_duckduckgo_error,
+            "wiki": self._is_wiki_error,
+        }
+        args = {"query": query, "max_results": self.max_results}
+        return {
+            name: functools.partial(
+                self.cache.call,
+                f"multi_search.{name}",
+                args,
+                func,
+                is_error=error_checks.get(name),
+            )
+            for name, func in sources.items()
+        }
+
+    def _merge(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        merged: Dict[str, Any] = {}
+        for name, result in results.items():
+            if isinstance(result, BaseException):
+                logger.warning(f"Search source `{name}` failed: {result}")
+                merged[name] = f"Error: {result}"
+            else:
+                merged[name] = result
+
+        self._deduplicate(merged)
+        return merged
+
+    async def amulti_search(self, query: str) -> Dict[str, Any]:
+        r"""Asynchronous version of :meth:`multi_search`."""
+        loop = asyncio.get_running_loop()
+        sources = self._sources(query)
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, func) for func in sources.values()),
+            return_exceptions=True,
+        )
+        return self._merge(dict(zip(sources, results)))
+
+    def _deduplicate(self, merged: Dict[str, Any]) -> None:
+        arxiv = merged.get("arxiv")
+        semantic_scholar = merged.get("semantic_scholar")
+        if not isinstance(arxiv, list) or not isinstance(semantic_scholar, dict):
+            return
+        papers = semantic_scholar.get("data")
+        if not isinstance(papers, list):
+            return
+
+        arxiv_titles = {
+            self._normalize_title(paper["title"])
+            for paper in arxiv
+            if isinstance(paper, dict) and isinstance(paper.get("title"), str)
+        }
+        kept = [
+            paper
+            for paper in papers
+            if not (
+                isinstance(paper, dict)
+                and isinstance(paper.get("title"), str)
+                and self._normalize_title(paper["title"]) in arxiv_titles
+            )
+        ]
+        if len(kept) < len(papers):
+            logger.debug(
+                f"Dropped {len(papers) - len(kept)} duplicate Semantic Scholar papers"
+            )
+            semantic_scholar["data"] = kept
+
+    @staticmethod
+    def _normalize_title(title: str) -> str:
+        return _TITLE_NOISE.sub(" ", title).strip().lower()
+
+    def multi_search(self, query: str) -> Dict[str, Any]:
+        r"""Search Arxiv, Semantic Scholar, DuckDuckGo and Wikipedia in parallel.
+
+        A failing source does not affect the others; its entry in the result
+        contains the error message instead.
+
+        Args:
+            query (str): The search query, e.g. a research topic or keywords.
+
+        Returns:
+            Dict[str, Any]: The results of each source, keyed by source name
+                (`arxiv`, `semantic_scholar`, `duckduckgo`, `wiki`).
+        """
+        logger.debug(f"Calling multi_search function with query=`{query}`")
+        futures = {
+            name: self._executor.submit(func)
+            for name, func in self._sources(query).items()
+        }
+        results: Dict[str, Any] = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = e
+        return self._merge(results)
+
+    def get_tools(self) -> List[FunctionTool]:
+        r"""Returns a list of FunctionTool objects representing the
+        functions in the toolkit.
+
+        Returns:
+            List[FunctionTool]: A list of FunctionTool objects representing
+                the functions in the toolkit.
+        """
+        return [FunctionTool(self.multi_search)]
@@ -0,0 +1,210 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+from camel.embeddings import BaseEmbedding, OpenAIEmbedding
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SemanticCache:
+    r"""A persistent cache that matches requests by embedding similarity.
+
+    Requests are embedded and compared by cosine similarity against all
+    previously stored requests, so differently worded but equivalent prompts
+    can reuse an earlier answer. SQLite is the only storage: each entry keeps
+    its normalized vectors next to the answer, and computed embeddings are
+    cached by the sha256 of their text. Several processes can therefore share
+    one cache directory. Requests with exactly the same text are found
+    through an SQLite index without embedding anything.
+
+    Args:
+        cache_dir (str): Directory where the cache files are stored.
+        threshold (float): Minimum cosine similarity for a hit.
+            (default: :obj:`0.92`)
+        embedding (Optional[BaseEmbedding]): Default embedding model. It can
+            be overridden per call, e.g. to use the caller's API key. If
+            neither is given, OpenAI's `text-embedding-3-small` is created
+            from the environment on first use.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        threshold: float = 0.92,
+        embedding: Optional[BaseEmbedding] = None,
+    ):
+        self.threshold = threshold
+        self._embedding = embedding
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, "semantic_cache.db"),
+            timeout=30,
+            check_same_thread=False,
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT, tag TEXT, "
+            "vector BLOB, topic_vector BLOB, answer TEXT, path TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_key ON entries (key, tag)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_tag ON entries (tag)")
+        self._conn.commit()
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def embed(
+        self, text: str, embedding: Optional[BaseEmbedding] = None
+    ) -> np.ndarray:
+        r"""Return the normalized embedding of `text`, reusing earlier results
+        for identical text.
+
+        Args:
+            text (str): The text to embed.
+            embedding (Optional[BaseEmbedding]): Embedding model to use
+                instead of the cache's default one.
+        """
+        key = self._key(text)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is not None:
+            return np.frombuffer(row[0], dtype=np.float32)
+
+        if embedding is None:
+            with self._lock:
+                if self._embedding is None:
+                    self._embedding = OpenAIEmbedding()
+            embedding = self._embedding
+        vector = np.asarray(embedding.embed(text), dtype=np.float32)
+        vector /= np.linalg.norm(vector)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                (key, vector.tobytes()),
+            )
+            self._conn.commit()
+        return vector
+
+    def lookup(
+        self,
+        text: str,
+        tag: str = "",
+        topic: Optional[str] = None,
+        embedding: Optional[BaseEmbedding] = None,
+    ) -> Optional[Tuple[str, str]]:
+        r"""Find a cached answer for a request similar to `text`.
+
+        Args:
+            text (str): The request text.
+            tag (str): Only entries stored with the same tag are considered,
+                e.g. to separate parameters that must match exactly.
+                (default: :obj:`""`)
+            topic (Optional[str]): If given, the stored entry's topic must be
+                similar on its own as well, so that a long shared part of
+                `text` cannot make different topics match.
+            embedding (Optional[BaseEmbedding]): Embedding model to use
+                instead of the cache's default one.
+
+        Returns:
+            Optional[Tuple[str, str]]: The cached `(answer, path)`, or `None`
+                if no stored request is similar enough.
+        """
+        with self._lock:
+            exact = self._conn.execute(
+                "SELECT answer, path FROM entries WHERE key = ? AND tag = ? "
+                "ORDER BY id DESC LIMIT 1",
+                (self._key(text), tag),
+            ).fetchone()
+        if exact is not None:
+            logger.info("Semantic cache hit for identical request")
+            return exact
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, vector, topic_vector FROM entries WHERE tag = ?", (tag,)
+            ).fetchall()
+        if topic is not None:
+            rows = [row for row in rows if row[2] is not None]
+        if not rows:
+            return None
+
+        ids = [row[0] for row in rows]
+        vectors = np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+        scores = vectors @ self.embed(text, embedding)
+        if topic is not None:
+            topic_vectors = np.stack(
+                [np.frombuffer(row[2], dtype=np.float32) for row in rows]
+            )
+            topic_scores = topic_vectors @ self.embed(topic, embedding)
+            # Only entries whose topic matches on its own are candidates
+            scores = np.where(topic_scores >= self.threshold, scores, -1.0)
+
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        logger.info(f"Semantic cache hit with similarity {scores[best]:.3f}")
+        with self._lock:
+            return self._conn.execute(
+                "SELECT answer, path FROM entries WHERE id = ?", (ids[best],)
+            ).fetchone()
+
+    def add(
+        self,
+        text: str,
+        answer: str,
+        path: str = "",
+        tag: str = "",
+        topic: Optional[str] = None,
+        embedding: Optional[BaseEmbedding] = None,
+    ) -> None:
+        r"""Store `answer` (and the file it was saved to) for request `text`.
+
+        `tag`, `topic` and `embedding` have the same meaning as in
+        :meth:`lookup`.
+        """
+        vector = self.embed(text, embedding)
+        topic_vector = None if topic is None else self.embed(topic, embedding)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO entries (key, tag, vector, topic_vector, answer, path) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self._key(text),
+                    tag,
+                    vector.tobytes(),
+                    None if topic_vector is None else topic_vector.tobytes(),
+                    answer,
+                    path,
+                ),
+            )
+            self._conn.commit()
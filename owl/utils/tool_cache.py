@@ -0,0 +1,169 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+_MISSING = object()
+
+
+class DiskCache:
+    r"""A filesystem cache for the results of (network bound) tool calls.
+
+    Each result is stored as a gzip-compressed JSON file named after the
+    sha256 of the tool name and its arguments. Entries expire after `ttl`
+    seconds, and once the cache grows beyond `max_size` bytes the least
+    recently used entries are removed by a background thread.
+
+    Only results that can be serialized to JSON are cached; exceptions are
+    never cached. Many tools report failures as return values instead of
+    raising; pass an `is_error` predicate to keep those out of the cache.
+
+    Args:
+        cache_dir (str): Directory where the cache files are stored.
+            (default: :obj:`"./.owl_cache"`)
+        ttl (float): Time in seconds after which an entry expires.
+            (default: one week)
+        max_size (int): Maximum total size of the cache in bytes.
+            (default: 500MB)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "./.owl_cache",
+        ttl: float = 7 * 86400,
+        max_size: int = 500 * 1024 * 1024,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size = max_size
+        self._sweeping = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, name: str, args: Dict[str, Any]) -> str:
+        key = name + json.dumps(args, sort_keys=True, default=str)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json.gz")
+
+    def _get(self, path: str) -> Any:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return _MISSING
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring corrupt cache entry {path}: {e}")
+            return _MISSING
+
+        if time.time() - entry["time"] > self.ttl:
+            return _MISSING
+        # Mark the entry as recently used for eviction
+        os.utime(path)
+        return entry["value"]
+
+    def _set(self, path: str, value: Any) -> None:
+        try:
+            data = json.dumps({"time": time.time(), "value": value})
+        except (TypeError, ValueError):
+            return
+
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(data.encode("utf-8")))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The result is still valid, it just won't be cached
+            logger.warning(f"Failed to write cache entry {path}: {e}")
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return
+
+        if not self._sweeping.locked():
+            threading.Thread(target=self._sweep, daemon=True).start()
+
+    def _sweep(self) -> None:
+        if not self._sweeping.acquire(blocking=False):
+            return
+        try:
+            entries = []
+            total_size = 0
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".json.gz"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total_size += stat.st_size
+            if total_size <= self.max_size:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total_size -= size
+                if total_size <= self.max_size:
+                    break
+        finally:
+            self._sweeping.release()
+
+    def call(
+        self,
+        name: str,
+        args: Dict[str, Any],
+        func: Callable[[], Any],
+        is_error: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        r"""Return the cached result for `name` called with `args`, calling
+        `func` and caching its result if there is none.
+
+        Args:
+            name (str): The name of the tool.
+            args (Dict[str, Any]): The arguments identifying the call.
+            func (Callable[[], Any]): Computes the result on a cache miss.
+            is_error (Optional[Callable[[Any], bool]]): Returns `True` for
+                results that describe a failure; those are not cached.
+                (default: :obj:`None`)
+
+        Returns:
+            Any: The cached or computed result.
+        """
+        path = self._path(name, args)
+        value = self._get(path)
+        if value is not _MISSING:
+            logger.debug(f"Using cached result for {name}")
+            return value
+
+        value = func()
+        if is_error is not None and is_error(value):
+            logger.debug(f"Not caching failed result for {name}")
+            return value
+        self._set(path, value)
+        return value
@@ -14,16 +14,28 @@
 
 import sys
 import os
+import functools
 import pathlib
-import gradio as gr
 import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Add the parent directory to sys.path
 sys.path.append(str(pathlib.Path(__file__).parent.parent))
 
-from examples.scientific_essay_generator import construct_scientific_essay_society
-from owl.utils import run_society
+from examples.scientific_essay_generator import (
+    add_cached_essay,
+    build_society,
+    get_static_resources,
+    lookup_cached_essay,
+    revise_essay,
+    safe_topic_name,
+    saved_essay,
+)
+from camel.embeddings import OpenAIEmbedding
+
+from owl.utils import run_society, AsyncFileWriter, SemanticCache
 
 # Load environment variables
 base_dir = pathlib.Path(__file__).parent.parent
@@ -34,59 +46,161 @@ load_dotenv(dotenv_path=str(env_path))
 essays_dir = base_dir / "essays"
 essays_dir.mkdir(exist_ok=True)
 
-def generate_essay(api_key, topic, pages, instructions, progress=None):
+# Essays are reused for semantically equivalent requests
+essay_cache = SemanticCache(str(essays_dir / ".semantic_cache"))
+
+
+@functools.lru_cache(maxsize=32)
+def get_embedding(api_key):
+    """Return the embedding model for the essay cache, one per API key."""
+    return OpenAIEmbedding(api_key=api_key)
+
+
+# Essays are written to disk without blocking the event loop
+essay_writer = AsyncFileWriter()
+
+# Number of essays that can be generated at the same time
+CONCURRENCY_LIMIT = 10
+
+# Society runs and revisions take minutes, so they get their own threads
+# instead of occupying the event loop's default executor, which is shared
+# with the short cache and setup calls
+essay_executor = ThreadPoolExecutor(
+    max_workers=CONCURRENCY_LIMIT, thread_name_prefix="essay"
+)
+
+
+async def generate_essay(
+    api_key, topic, pages, instructions, quality="final", use_cache=True, progress=None
+):
     """Generate a scientific essay using the OWL framework.
     
+    This is an async generator: it yields the assistant's latest output after
+    every conversation round so the UI can render progress before the essay is
+    done. Blocking work runs in worker threads, so several essays can be
+    generated concurrently.
+    
     Args:
         api_key (str): OpenAI API key to use
         topic (str): Topic for the scientific essay
         pages (int): Number of pages to generate
         instructions (str): Additional instructions for the essay
+        quality (str): "draft" keeps the GPT-4o-mini essay, "final" adds a
+            GPT-4o revision pass
+        use_cache (bool): Whether an essay for a similar earlier request may
+            be returned instead of generating a new one
         progress (gr.Progress, optional): Progress component
         
-    Returns:
-        tuple: (essay content, output filename, token count)
+    Yields:
+        tuple: (essay content, output filename, token count). The filename and
+            token count are only set in the final update.
     """
-    # Set the API key in environment
-    os.environ["OPENAI_API_KEY"] = api_key
+    # Return an essay generated for a semantically equivalent request
+    embedding = get_embedding(api_key)
+    cache_text = f"{topic}\n{instructions}"
+    cache_tag = f"{pages}:{quality}"
+    cached = None
+    if use_cache:
+        cached = await asyncio.to_thread(
+            lookup_cached_essay,
+            essay_cache,
+            cache_text,
+            cache_tag,
+            topic,
+            embedding,
+        )
+    if cached is not None:
+        answer, cached_path = cached
+        if progress:
+            progress(1.0, desc="Essay loaded from cache!")
+        yield answer, cached_path, 0
+        return
     
     # Progress stages
     if progress:
         progress(0.1, desc="Setting up agent society...")
     
-    # Construct the society
-    society = construct_scientific_essay_society(
+    # Construct the society; models and tools are built once per API key and
+    # reused across requests
+    resources = await asyncio.to_thread(get_static_resources, api_key=api_key)
+    society = await asyncio.to_thread(
+        build_society,
         topic=topic,
         pages=pages,
-        instructions=instructions
+        instructions=instructions,
+        resources=resources,
     )
     
     if progress:
         progress(0.2, desc="Researching and generating essay...")
     
-    # Generate the essay
-    answer, chat_history, token_count = run_society(society)
+    # Run the society on the essay threads and forward each round to the UI
+    loop = asyncio.get_running_loop()
+    rounds = asyncio.Queue()
+    task = loop.run_in_executor(
+        essay_executor,
+        functools.partial(
+            run_society,
+            society,
+            on_round=lambda data: loop.call_soon_threadsafe(rounds.put_nowait, data),
+            keep_history=False,
+        ),
+    )
+    task.add_done_callback(lambda _: rounds.put_nowait(None))
+    
+    saved = None
+    while (round_data := await rounds.get()) is not None:
+        saved = saved_essay(round_data) or saved
+        if round_data["assistant"]:
+            yield round_data["assistant"], "", 0
+    
+    answer, chat_history, token_count = await task
+    # Prefer the essay the assistant saved over its final message
+    answer = saved or answer
+    
+    if quality == "final":
+        if progress:
+            progress(0.8, desc="Revising essay...")
+        yield answer, "", 0
+        answer, usage = await loop.run_in_executor(
+            essay_executor, revise_essay, answer, topic, pages, instructions, api_key
+        )
+        token_count["completion_token_count"] += usage.get("completion_tokens", 0)
+        token_count["prompt_token_count"] += usage.get("prompt_tokens", 0)
     
     if progress:
         progress(0.9, desc="Finalizing essay...")
     
     # Generate output filename
-    safe_topic = "".join(c if c.isalnum() else "_" for c in topic)
+    safe_topic = safe_topic_name(topic)
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     output_filename = f"scientific_essay_{safe_topic}_{timestamp}.md"
     full_path = essays_dir / output_filename
     
     # Save the essay
-    with open(full_path, "w") as f:
-        f.write(answer)
+    essay_writer.write(full_path, answer)
+    
+    await asyncio.to_thread(
+        add_cached_essay,
+        essay_cache,
+        cache_text,
+        answer,
+        str(full_path),
+        cache_tag,
+        topic,
+        embedding,
+    )
+    await asyncio.to_thread(essay_writer.flush, [full_path])
     
     if progress:
         progress(1.0, desc="Essay completed!")
     
-    return answer, str(full_path), token_count
+    yield answer, str(full_path), token_count
 
 # Gradio interface
 def create_interface():
+    import gradio as gr
+    
     with gr.Blocks(title="Scientific Essay Generator", theme=gr.themes.Soft()) as interface:
         gr.Markdown(
             """
@@ -116,6 +230,16 @@ def create_interface():
                     step=1,
                     interactive=True
                 )
+                quality = gr.Dropdown(
+                    label="Quality",
+                    choices=["draft", "final"],
+                    value="final",
+                    info="'final' adds a GPT-4o revision pass to the GPT-4o-mini draft"
+                )
+                regenerate = gr.Checkbox(
+                    label="Regenerate (ignore cache)",
+                    value=False
+                )
                 
         topic = gr.Textbox(
             label="Essay Topic",
@@ -143,25 +267,31 @@ def create_interface():
                 file_path = gr.Textbox(label="Saved to", interactive=False)
                 token_count = gr.Number(label="Tokens Used", interactive=False)
         
-        def on_generate(api_key, topic, pages, instructions, progress=gr.Progress()):
+        async def on_generate(api_key, topic, pages, instructions, quality, regenerate, progress=gr.Progress()):
             if not api_key:
-                return "Please enter your OpenAI API key", "", 0
+                yield "Please enter your OpenAI API key", "", 0
+                return
             if not topic:
-                return "Please enter a topic for your essay", "", 0
+                yield "Please enter a topic for your essay", "", 0
+                return
             
             status_text.update("Generating essay...")
             
             try:
-                essay, path, tokens = generate_essay(api_key, topic, pages, instructions, progress)
+                # Stream partial output into the preview as each round finishes
+                async for update in generate_essay(
+                    api_key, topic, pages, instructions, quality,
+                    use_cache=not regenerate, progress=progress
+                ):
+                    yield update
                 status_text.update("Essay generation completed!")
-                return essay, path, tokens
             except Exception as e:
                 status_text.update(f"Error: {str(e)}")
-                return f"Error: {str(e)}", "", 0
+                yield f"Error: {str(e)}", "", 0
         
         generate_button.click(
             fn=on_generate,
-            inputs=[api_key, topic, pages, instructions],
+            inputs=[api_key, topic, pages, instructions, quality, regenerate],
             outputs=[essay_output, file_path, token_count]
         )
         
@@ -192,8 +322,14 @@ def create_interface():
     return interface
 
 if __name__ == "__main__":
+    import gradio as gr
+    
     # Create and launch the interface
     interface = create_interface()
-    # Enable queue (required for progress tracking)
-    interface.queue()
+    # Enable queue (required for progress tracking) and let several essays
+    # be generated at once; the option was renamed in Gradio 4
+    if int(gr.__version__.split(".")[0]) >= 4:
+        interface.queue(default_concurrency_limit=CONCURRENCY_LIMIT)
+    else:
+        interface.queue(concurrency_count=CONCURRENCY_LIMIT)
     interface.launch(share=False, inbrowser=True) 
\ No newline at end of file